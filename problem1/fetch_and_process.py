@@ -2,7 +2,7 @@ import sys
 import os
 import json
 import time
-import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from urllib.request import urlopen, Request
 from urllib.error import URLError, HTTPError
@@ -10,7 +10,11 @@ from urllib.error import URLError, HTTPError
 # -------- Config --------
 USER_AGENT = "EE547-HW1-HTTPFetcher/1.0"
 TIMEOUT_SEC = 10
-WORD_RE = re.compile(r"[A-Za-z0-9]+")  
+MAX_WORKERS = 32
+CHUNK_SIZE = 65536
+WORD_BYTES = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+# byte -> b"1" for [A-Za-z0-9], b"0" otherwise; a word starts at every "01" edge
+WORD_MASK = bytes(0x31 if b in WORD_BYTES else 0x30 for b in range(256))
 
 # -------- Helpers --------
 def now_utc_iso() -> str:
@@ -19,10 +23,28 @@ def now_utc_iso() -> str:
 def is_text_content(content_type: str) -> bool:
     return (content_type or "").lower().find("text") != -1
 
-def count_words(text: str) -> int:
-    if not text:
+def count_words(data: bytes, prev: bytes = b"0") -> int:
+    """Count [A-Za-z0-9]+ runs in data; prev is the mask byte of the preceding chunk."""
+    if not data:
         return 0
-    return len(WORD_RE.findall(text))
+    mask = data.translate(WORD_MASK)
+    return mask.count(b"01") + (prev == b"0" and mask[:1] == b"1")
+
+def read_and_count(stream, is_text: bool):
+    """Read stream in chunks; return (bytes read, word count or None)."""
+    total_len = 0
+    if not is_text:
+        while chunk := stream.read(CHUNK_SIZE):
+            total_len += len(chunk)
+        return total_len, None
+
+    wc = 0
+    prev = b"0"
+    while chunk := stream.read(CHUNK_SIZE):
+        total_len += len(chunk)
+        wc += count_words(chunk, prev)
+        prev = WORD_MASK[chunk[-1]:chunk[-1] + 1]
+    return total_len, wc
 
 def ensure_dir(path: str) -> None:
     if not os.path.isdir(path):
@@ -37,49 +59,31 @@ def process_url(url: str):
 
     try:
         with urlopen(req, timeout=TIMEOUT_SEC) as resp:
-            body = resp.read()
-            elapsed_ms = (time.perf_counter() - t0) * 1000.0
             status_code = getattr(resp, "status", None)
             content_type = resp.headers.get("Content-Type", "")
-
-            if is_text_content(content_type):
-                try:
-                    text = body.decode("utf-8", errors="ignore")
-                    wc = count_words(text)
-                except Exception:
-                    wc = 0
-            else:
-                wc = None  
+            content_length, wc = read_and_count(resp, is_text_content(content_type))
+            elapsed_ms = (time.perf_counter() - t0) * 1000.0
 
             return {
                 "url": url,
                 "status_code": int(status_code) if status_code is not None else None,
                 "response_time_ms": float(round(elapsed_ms, 3)),
-                "content_length": int(len(body)),
+                "content_length": int(content_length),
                 "word_count": wc if wc is not None else None,
                 "timestamp": timestamp,
                 "error": None
             }, False, None
 
     except HTTPError as e:
-        body = e.read() or b""
-        elapsed_ms = (time.perf_counter() - t0) * 1000.0
         content_type = getattr(e, "headers", {}).get("Content-Type", "") if hasattr(e, "headers") else ""
-
-        if is_text_content(content_type):
-            try:
-                text = body.decode("utf-8", errors="ignore")
-                wc = count_words(text)
-            except Exception:
-                wc = 0
-        else:
-            wc = None
+        content_length, wc = read_and_count(e, is_text_content(content_type))
+        elapsed_ms = (time.perf_counter() - t0) * 1000.0
 
         rec = {
             "url": url,
             "status_code": int(getattr(e, "code", 0)) if getattr(e, "code", None) is not None else None,
             "response_time_ms": float(round(elapsed_ms, 3)),
-            "content_length": int(len(body)),
+            "content_length": int(content_length),
             "word_count": wc if wc is not None else None,
             "timestamp": timestamp,
             "error": None  
@@ -119,35 +123,41 @@ def main():
 
     # ---- Processing ----
     processing_start = now_utc_iso()
-    responses = []
     errors = []
+    total_urls = 0
+    successful_requests = 0
+    sum_ms = 0.0
+    total_bytes = 0
+    status_code_distribution = {}
 
-    for url in urls:
-        rec, had_error, err_line = process_url(url)
-        responses.append(rec)
-        if had_error and err_line:
-            errors.append(err_line)
-
-    processing_end = now_utc_iso()
-
-    # ---- Write responses.json ----
+    # ---- Write responses.json as records arrive ----
+    # same layout as json.dumps(list, indent=2), without holding the list
     responses_path = os.path.join(output_dir, "responses.json")
     with open(responses_path, "w", encoding="utf-8") as f:
-        json.dump(responses, f, indent=2, ensure_ascii=False)
+        f.write("[")
+        # I/O-bound: fetch concurrently; ex.map keeps results in input order
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_WORKERS, len(urls)))) as ex:
+            for rec, had_error, err_line in ex.map(process_url, urls):
+                f.write(("\n  " if total_urls == 0 else ",\n  ")
+                        + json.dumps(rec, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+                total_urls += 1
+                if rec["error"] is None:
+                    successful_requests += 1
+                sum_ms += rec["response_time_ms"]
+                total_bytes += int(rec["content_length"])
+                code = rec["status_code"]
+                if code is not None:
+                    key = str(int(code))
+                    status_code_distribution[key] = status_code_distribution.get(key, 0) + 1
+                if had_error and err_line:
+                    errors.append(err_line)
+        f.write("\n]" if total_urls else "]")
+
+    processing_end = now_utc_iso()
 
     # ---- summary.json ----
-    total_urls = len(responses)
-    successful_requests = sum(1 for r in responses if r["error"] is None)
     failed_requests = total_urls - successful_requests
-    avg_ms = round(sum(r["response_time_ms"] for r in responses) / total_urls, 3) if total_urls else 0.0
-    total_bytes = sum(int(r["content_length"]) for r in responses)
-
-    status_code_distribution = {}
-    for r in responses:
-        code = r["status_code"]
-        if code is not None:
-            key = str(int(code))
-            status_code_distribution[key] = status_code_distribution.get(key, 0) + 1
+    avg_ms = round(sum_ms / total_urls, 3) if total_urls else 0.0
 
     summary = {
         "total_urls": total_urls,
@@ -162,7 +172,7 @@ def main():
 
     summary_path = os.path.join(output_dir, "summary.json")
     with open(summary_path, "w", encoding="utf-8") as f:
-        json.dump(summary, f, indent=2, ensure_ascii=False)
+        f.write(json.dumps(summary, indent=2, ensure_ascii=False))
 
     # ---- errors.log ----
     errors_path = os.path.join(output_dir, "errors.log")
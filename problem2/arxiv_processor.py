@@ -1,20 +1,27 @@
-import sys, os, json, re, time
+import sys, os, io, json, re, time
 from urllib.request import urlopen, Request
 from urllib.parse import urlencode
 from urllib.error import URLError, HTTPError
 import xml.etree.ElementTree as ET
-from collections import Counter, defaultdict
+from collections import Counter
 from datetime import datetime, timezone
 
 API = "http://export.arxiv.org/api/query"
 UA = "EE547-HW1-ArXivProcessor/1.0"
 TIMEOUT = 10
 MAX_ALLOWED = 100
-STOPWORDS = {'the','a','an','and','or','but','in','on','at','to','for','of','with','by','from','up','about','into','through','during','is','are','was','were','be','been','being','have','has','had','do','does','did','will','would','could','should','may','might','can','this','that','these','those','i','you','he','she','it','we','they','what','which','who','when','where','why','how','all','each','every','both','few','more','most','other','some','such','as','also','very','too','only','so','than','not'}
+STOPWORDS = frozenset({'the','a','an','and','or','but','in','on','at','to','for','of','with','by','from','up','about','into','through','during','is','are','was','were','be','been','being','have','has','had','do','does','did','will','would','could','should','may','might','can','this','that','these','those','i','you','he','she','it','we','they','what','which','who','when','where','why','how','all','each','every','both','few','more','most','other','some','such','as','also','very','too','only','so','than','not'})
 WORD_RE = re.compile(r"[A-Za-z0-9]+")
 RAWWORD_RE = re.compile(r"[A-Za-z0-9\-]+")
 HYPHEN_RE = re.compile(r"\b[\w]+(?:-[\w]+)+\b")
 SENT_SPLIT_RE = re.compile(r"[.!?]+")
+# ASCII byte classes for sentence stats: "1" word char, "." sentence end, " " whitespace, "0" other
+SENT_MASK = bytes(
+    0x31 if chr(b).isalnum() and b < 128 else
+    0x2e if chr(b) in ".!?" else
+    0x20 if chr(b).isspace() else 0x30
+    for b in range(256)
+)
 
 def iso_now():
     return datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00","Z")
@@ -43,57 +50,76 @@ def http_get_with_retry(url, log_path):
             raise
 
 def parse_feed(xml_bytes, log_path):
+    ns = {"atom":"http://www.w3.org/2005/Atom","arxiv":"http://arxiv.org/schemas/atom"}
+    entry_tag = "{%s}entry" % ns["atom"]
+    entries = []
     try:
-        ns = {"atom":"http://www.w3.org/2005/Atom","arxiv":"http://arxiv.org/schemas/atom"}
-        root = ET.fromstring(xml_bytes)
+        # stream the feed; each <entry> is handled as soon as it closes, then freed
+        for _, e in ET.iterparse(io.BytesIO(xml_bytes), events=("end",)):
+            if e.tag == entry_tag:
+                rec = parse_entry(e, ns, log_path)
+                if rec is not None:
+                    entries.append(rec)
+                e.clear()
     except ET.ParseError as e:
         log_line(log_path, f"[ERROR] Invalid XML: {e}")
         return []
-    entries = []
-    for e in root.findall("atom:entry", ns):
-        try:
-            rid_full = (e.findtext("atom:id", default="", namespaces=ns) or "").strip()
-            rid = rid_full.rsplit("/", 1)[-1] if rid_full else ""
-            title = (e.findtext("atom:title", default="", namespaces=ns) or "").strip()
-            summary = (e.findtext("atom:summary", default="", namespaces=ns) or "").strip()
-            published = (e.findtext("atom:published", default="", namespaces=ns) or "").strip()
-            updated = (e.findtext("atom:updated", default="", namespaces=ns) or "").strip()
-            authors = []
-            for a in e.findall("atom:author", ns):
-                name = a.findtext("atom:name", default="", namespaces=ns)
-                if name:
-                    authors.append(name.strip())
-            categories = []
-            for c in e.findall("atom:category", ns):
-                term = c.attrib.get("term")
-                if term:
-                    categories.append(term)
-            entries.append({
-                "arxiv_id": rid,
-                "title": title,
-                "authors": authors,
-                "abstract": summary,
-                "categories": categories,
-                "published": published,
-                "updated": updated
-            })
-        except Exception as ex:
-            log_line(log_path, f"[WARN] Entry parse error: {ex}")
-            continue
     return entries
 
+def parse_entry(e, ns, log_path):
+    try:
+        rid_full = (e.findtext("atom:id", default="", namespaces=ns) or "").strip()
+        rid = rid_full.rsplit("/", 1)[-1] if rid_full else ""
+        title = (e.findtext("atom:title", default="", namespaces=ns) or "").strip()
+        summary = (e.findtext("atom:summary", default="", namespaces=ns) or "").strip()
+        published = (e.findtext("atom:published", default="", namespaces=ns) or "").strip()
+        updated = (e.findtext("atom:updated", default="", namespaces=ns) or "").strip()
+        authors = []
+        for a in e.findall("atom:author", ns):
+            name = a.findtext("atom:name", default="", namespaces=ns)
+            if name:
+                authors.append(name.strip())
+        categories = []
+        for c in e.findall("atom:category", ns):
+            term = c.attrib.get("term")
+            if term:
+                categories.append(term)
+        return {
+            "arxiv_id": rid,
+            "title": title,
+            "authors": authors,
+            "abstract": summary,
+            "categories": categories,
+            "published": published,
+            "updated": updated
+        }
+    except Exception as ex:
+        log_line(log_path, f"[WARN] Entry parse error: {ex}")
+        return None
+
 def abstract_stats(text):
     t = text or ""
-    tokens = WORD_RE.findall(t)
-    lower = [w.lower() for w in tokens]
+    is_ascii = t.isascii()
+    if is_ascii:
+        # one C-level lower() over the whole abstract; safe since ASCII maps to ASCII
+        tokens = lower = WORD_RE.findall(t.lower())
+    else:
+        # non-ASCII lower() can produce ASCII letters (e.g. KELVIN SIGN -> 'k')
+        tokens = WORD_RE.findall(t)
+        lower = [w.lower() for w in tokens]
     total_words = len(tokens)
     unique_words = len(set(lower))
-    kept = [w for w in lower if w not in STOPWORDS]
-    top20 = [{"word": w, "count": c} for w, c in Counter(kept).most_common(20)]
+    kept = Counter(w for w in lower if w not in STOPWORDS)
+    top20 = [{"word": w, "count": c} for w, c in kept.most_common(20)]
     avg_word_length = round(sum(len(w) for w in tokens)/total_words, 3) if total_words else 0.0
-    sentences = [s for s in SENT_SPLIT_RE.split(t) if s.strip()]
-    total_sentences = len(sentences)
-    sent_word_counts = [len(WORD_RE.findall(s)) for s in sentences]
+    if is_ascii:
+        # single translate+split over the abstract; a word starts at each "01"/" 1" edge
+        pieces = [p for p in t.encode("ascii").translate(SENT_MASK).split(b".") if p.strip(b" ")]
+        sent_word_counts = [p.count(b"01") + p.count(b" 1") + p.startswith(b"1") for p in pieces]
+    else:
+        sentences = [s for s in SENT_SPLIT_RE.split(t) if s.strip()]
+        sent_word_counts = [len(WORD_RE.findall(s)) for s in sentences]
+    total_sentences = len(sent_word_counts)
     avg_words_per_sentence = round(sum(sent_word_counts)/total_sentences, 3) if total_sentences else 0.0
     longest_sentence = max(sent_word_counts) if sent_word_counts else 0
     shortest_sentence = min(sent_word_counts) if sent_word_counts else 0
@@ -101,7 +127,7 @@ def abstract_stats(text):
     uppercase_terms = sorted({w for w in raw_words if any(ch.isupper() for ch in w)})
     numeric_terms = sorted({w for w in raw_words if any(ch.isdigit() for ch in w)})
     hyphenated_terms = sorted({w for w in HYPHEN_RE.findall(t)})
-    return {
+    stats = {
         "total_words": total_words,
         "unique_words": unique_words,
         "top20": top20,
@@ -114,6 +140,7 @@ def abstract_stats(text):
         "numeric_terms": numeric_terms,
         "hyphenated_terms": hyphenated_terms
     }
+    return stats, lower
 
 def main():
     if len(sys.argv) != 4:
@@ -148,7 +175,7 @@ def main():
         if not ent.get("arxiv_id") or not ent.get("title") or not ent.get("abstract"):
             log_line(log_path, f"[WARN] Missing required fields; skipped id={ent.get('arxiv_id','')}")
             continue
-        st = abstract_stats(ent["abstract"])
+        st, lower_tokens = abstract_stats(ent["abstract"])
         ent_out = {
             "arxiv_id": ent["arxiv_id"],
             "title": ent["title"],
@@ -166,44 +193,35 @@ def main():
             }
         }
         log_line(log_path, f"[INFO] Processing paper: {ent['arxiv_id']}")
-        valid.append((ent_out, st))
-    papers = [p for p,_ in valid]
+        valid.append((ent_out, st, lower_tokens))
+    papers = [p for p,_,_ in valid]
     papers_path = os.path.join(out_dir, "papers.json")
     with open(papers_path, "w", encoding="utf-8") as f:
-        json.dump(papers, f, indent=2, ensure_ascii=False)
-    total_words = sum(st["total_words"] for _,st in valid)
-    all_tokens_lower = []
-    doc_presence = defaultdict(int)
-    for _,st in valid:
-        seen = set()
-        for w,c in st["top20"]:
-            pass
-        for w in WORD_RE.findall((_["abstract"] if False else "")):
-            pass
+        f.write(json.dumps(papers, indent=2, ensure_ascii=False))
+    total_words = sum(st["total_words"] for _,st,_ in valid)
     global_counter = Counter()
     doc_counter = Counter()
-    for ent_out, st in valid:
-        toks = [w.lower() for w in WORD_RE.findall(ent_out["abstract"])]
-        toks = [w for w in toks if w not in STOPWORDS]
-        counts = Counter(toks)
-        global_counter.update(counts)
-        for w in counts.keys():
-            doc_counter[w] += 1
-    top_50 = [{"word": w, "frequency": c, "documents": doc_counter[w]} for w,c in global_counter.most_common(50)]
-    uppercase_terms = sorted({w for _,st in valid for w in st["uppercase_terms"]})
-    numeric_terms = sorted({w for _,st in valid for w in st["numeric_terms"]})
-    hyphenated_terms = sorted({w for _,st in valid for w in st["hyphenated_terms"]})
     unique_global = set()
     abstract_lengths = []
-    for ent_out, st in valid:
-        toks = [w.lower() for w in WORD_RE.findall(ent_out["abstract"])]
-        unique_global.update(toks)
+    uppercase_set, numeric_set, hyphenated_set = set(), set(), set()
+    for ent_out, st, lower_tokens in valid:
+        counts = Counter(w for w in lower_tokens if w not in STOPWORDS)
+        global_counter.update(counts)
+        doc_counter.update(counts.keys())
+        unique_global.update(lower_tokens)
         abstract_lengths.append(st["total_words"])
+        uppercase_set.update(st["uppercase_terms"])
+        numeric_set.update(st["numeric_terms"])
+        hyphenated_set.update(st["hyphenated_terms"])
+    top_50 = [{"word": w, "frequency": c, "documents": doc_counter[w]} for w,c in global_counter.most_common(50)]
+    uppercase_terms = sorted(uppercase_set)
+    numeric_terms = sorted(numeric_set)
+    hyphenated_terms = sorted(hyphenated_set)
     avg_abstract_length = round(sum(abstract_lengths)/len(abstract_lengths), 3) if abstract_lengths else 0.0
     longest_abs = max(abstract_lengths) if abstract_lengths else 0
     shortest_abs = min(abstract_lengths) if abstract_lengths else 0
     cat_dist = Counter()
-    for ent_out, _ in valid:
+    for ent_out, _, _ in valid:
         for c in ent_out.get("categories",[]):
             cat_dist[c] += 1
     corpus = {
@@ -228,7 +246,7 @@ def main():
     }
     corpus_path = os.path.join(out_dir, "corpus_analysis.json")
     with open(corpus_path, "w", encoding="utf-8") as f:
-        json.dump(corpus, f, indent=2, ensure_ascii=False)
+        f.write(json.dumps(corpus, indent=2, ensure_ascii=False))
     elapsed = time.perf_counter() - start_ts
     log_line(log_path, f"[INFO] Completed processing: {len(valid)} papers in {elapsed:.2f} seconds")
     print(f"[OK] Wrote: {papers_path}, {corpus_path}, {log_path}")
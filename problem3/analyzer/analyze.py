@@ -1,21 +1,52 @@
 #!/usr/bin/env python3
-import os, json, time, glob, re, itertools, collections
+import os, sys, json, time, glob, re, itertools, collections, signal
 from datetime import datetime, timezone
 
 def iso_utc():
     return datetime.now(timezone.utc).isoformat().replace("+00:00","Z")
 
+def wait_for(path, poll_sec=0.1, log_every_sec=2.0):
+    # short stat() poll so the stage starts right after the marker appears;
+    # the "Waiting" line is still printed only every log_every_sec
+    next_log = 0.0
+    while not os.path.exists(path):
+        now = time.monotonic()
+        if now >= next_log:
+            print(f"[{iso_utc()}] Waiting for {path} ...", flush=True)
+            next_log = now + log_every_sec
+        time.sleep(poll_sec)
+
+def write_json(path, obj):
+    # serialize fully in memory, then hand the bytes to the OS unbuffered
+    data = memoryview(json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8"))
+    with open(path, "wb", buffering=0) as f:
+        while data:
+            data = data[f.write(data):]
+
 def tokenize(text):
     return re.findall(r"[A-Za-z0-9]+", text or "")
 
-def jaccard_similarity(doc1_words, doc2_words):
-    set1, set2 = set(doc1_words), set(doc2_words)
-    inter = set1.intersection(set2)
-    union = set1.union(set2)
-    return len(inter) / len(union) if union else 0.0
+def token_bitset(words, vocab):
+    """Encode the distinct words as an int with bit vocab[w] set (ids assigned on first sight)."""
+    uniq = set(words)
+    for w in uniq:
+        if w not in vocab:
+            vocab[w] = len(vocab)
+    bits = bytearray((len(vocab) + 7) // 8)
+    for w in uniq:
+        i = vocab[w]
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, "little"), len(uniq)
+
+def jaccard_similarity(bits1, size1, bits2, size2):
+    inter = (bits1 & bits2).bit_count()
+    union = size1 + size2 - inter
+    return inter / union if union else 0.0
 
 def ngrams(words, n):
-    return [" ".join(words[i:i+n]) for i in range(len(words)-n+1)] if n>0 else []
+    # tuple keys, built in C by zipping shifted slices; joined into strings
+    # only for the reported top entries
+    return zip(*(words[i:] for i in range(n))) if n>0 else iter(())
 
 def main():
     print(f"[{iso_utc()}] Analyzer starting", flush=True)
@@ -26,14 +57,13 @@ def main():
     os.makedirs(out_dir, exist_ok=True)
 
     marker = os.path.join(status_dir, "process_complete.json")
-    while not os.path.exists(marker):
-        print(f"[{iso_utc()}] Waiting for {marker} ...", flush=True)
-        time.sleep(2)
+    wait_for(marker)
 
     files = sorted(glob.glob(os.path.join(proc_dir, "page_*.json")))
     print(f"[{iso_utc()}] Found {len(files)} processed documents", flush=True)
 
     docs = []
+    vocab = {}
     total_words = 0
     total_word_len = 0
     total_sentences = 0
@@ -41,12 +71,14 @@ def main():
     global_word_counter = collections.Counter()
     bigram_counter = collections.Counter()
     trigram_counter = collections.Counter()
+    # one shared str per distinct token, so n-gram keys don't pin per-doc copies
+    intern = sys.intern
 
     for path in files:
         with open(path, "r", encoding="utf-8") as f:
             obj = json.load(f)
         text = obj.get("text","")
-        tokens = [w.lower() for w in tokenize(text)]
+        tokens = [intern(w.lower()) for w in tokenize(text)]
         global_word_counter.update(tokens)
         bigram_counter.update(ngrams(tokens, 2))
         trigram_counter.update(ngrams(tokens, 3))
@@ -56,11 +88,13 @@ def main():
         sc = int(stats.get("sentence_count", 0))
         total_words += wc
         total_sentences += sc if sc>=0 else 0
-        total_word_len += sum(len(w) for w in tokens)
+        total_word_len += sum(map(len, tokens))
 
+        bits, size = token_bitset(tokens, vocab)
         docs.append({
             "name": os.path.basename(path),
-            "tokens": tokens
+            "bits": bits,
+            "size": size
         })
 
     top_100 = global_word_counter.most_common(100)
@@ -71,11 +105,11 @@ def main():
 
     sim_list = []
     for d1, d2 in itertools.combinations(docs, 2):
-        sim = jaccard_similarity(d1["tokens"], d2["tokens"])
+        sim = jaccard_similarity(d1["bits"], d1["size"], d2["bits"], d2["size"])
         sim_list.append({"doc1": d1["name"], "doc2": d2["name"], "similarity": round(sim, 6)})
 
-    top_bigrams = [{"bigram": bg, "count": c} for bg, c in bigram_counter.most_common(100)]
-    top_trigrams = [{"trigram": tg, "count": c} for tg, c in trigram_counter.most_common(100)]
+    top_bigrams = [{"bigram": " ".join(bg), "count": c} for bg, c in bigram_counter.most_common(100)]
+    top_trigrams = [{"trigram": " ".join(tg), "count": c} for tg, c in trigram_counter.most_common(100)]
 
     avg_sentence_length = (total_words/total_sentences) if total_sentences else 0.0
     avg_word_length = (total_word_len/total_words) if total_words else 0.0
@@ -101,14 +135,15 @@ def main():
     }
 
     out_path = os.path.join(out_dir, "final_report.json")
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(report, f, ensure_ascii=False, indent=2)
+    write_json(out_path, report)
 
     print(f"[{iso_utc()}] Analyzer complete -> {out_path}", flush=True)
 
+    # stay up for run_pipeline.sh to collect the report, blocked in one syscall;
+    # as PID 1 we need an explicit handler or SIGTERM from `down` is ignored
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
     try:
-        for _ in range(180):
-            time.sleep(1)
+        signal.pause()
     except KeyboardInterrupt:
         pass
 
@@ -1,39 +1,93 @@
 #!/usr/bin/env python3
-import os, re, json, time, glob
+import os, re, json, time, glob, itertools
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
 
+WORD_BYTES = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+# byte -> b"1" for [A-Za-z0-9], b"0" otherwise; a word starts at every "01" edge
+WORD_MASK = bytes(0x31 if b in WORD_BYTES else 0x30 for b in range(256))
+
+SKIP_RE = re.compile(r'<script[^>]*>.*?</script>|<style[^>]*>.*?</style>', re.DOTALL | re.IGNORECASE)
+HREF_RE = re.compile(r'href=[\'"]?([^\'" >]+)', re.IGNORECASE)
+SRC_RE = re.compile(r'src=[\'"]?([^\'" >]+)', re.IGNORECASE)
+TAG_RE = re.compile(r'<[^>]+>')
+SENT_RE = re.compile(r'[.!?]+')
+PARA_RE = re.compile(r'<\s*p\b|<\s*br\b|</\s*p\s*>|<\s*div\b|<\s*li\b', re.IGNORECASE)
+
 def iso_utc():
     return datetime.now(timezone.utc).isoformat().replace("+00:00","Z")
 
-def strip_html(html_content):
-    html_content = re.sub(r'<script[^>]*>.*?</script>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
-    html_content = re.sub(r'<style[^>]*>.*?</style>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
-    links = re.findall(r'href=[\'"]?([^\'" >]+)', html_content, flags=re.IGNORECASE)
-    images = re.findall(r'src=[\'"]?([^\'" >]+)', html_content, flags=re.IGNORECASE)
-    text = re.sub(r'<[^>]+>', ' ', html_content)
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text, links, images
+def wait_for(path, poll_sec=0.1, log_every_sec=2.0):
+    # short stat() poll so the stage starts right after the marker appears;
+    # the "Waiting" line is still printed only every log_every_sec
+    next_log = 0.0
+    while not os.path.exists(path):
+        now = time.monotonic()
+        if now >= next_log:
+            print(f"[{iso_utc()}] Waiting for {path} ...", flush=True)
+            next_log = now + log_every_sec
+        time.sleep(poll_sec)
+
+def write_json(path, obj):
+    # serialize fully in memory, then hand the bytes to the OS unbuffered
+    data = memoryview(json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8"))
+    with open(path, "wb", buffering=0) as f:
+        while data:
+            data = data[f.write(data):]
+
+def parse_html(html_content):
+    """Return (text, links, images, paragraph_count) from one parse of the document."""
+    pc = len(PARA_RE.findall(html_content))
+    html_content = SKIP_RE.sub('', html_content)
+    links = HREF_RE.findall(html_content)
+    images = SRC_RE.findall(html_content)
+    # str.split() and \s share the same whitespace definition
+    text = ' '.join(TAG_RE.sub(' ', html_content).split())
+    if pc == 0 and text:
+        pc = 1
+    return text, links, images, pc
 
 def word_stats(text):
-    tokens = re.findall(r'[A-Za-z0-9]+', text)
-    wc = len(tokens)
-    avg_wlen = round(sum(len(w) for w in tokens)/wc, 3) if wc else 0.0
+    # non-ASCII chars encode to bytes >= 0x80, so they never count as word bytes
+    mask = text.encode("utf-8").translate(WORD_MASK)
+    wc = mask.count(b"01") + mask.startswith(b"1")
+    avg_wlen = round(mask.count(b"1")/wc, 3) if wc else 0.0
     return wc, avg_wlen
 
 def sentence_count(text):
     if not text:
         return 0
-    parts = re.split(r'[.!?]+', text)
+    parts = SENT_RE.split(text)
     return len([p for p in parts if p.strip()])
 
-def paragraph_count_from_html(html):
-    c = 0
-    for pat in (r'<\s*p\b', r'<\s*br\b', r'</\s*p\s*>', r'<\s*div\b', r'<\s*li\b'):
-        c += len(re.findall(pat, html, flags=re.IGNORECASE))
-    if c == 0:
-        t, _, _ = strip_html(html)
-        return 1 if t else 0
-    return c
+def process_one(path, out_dir):
+    """Process one HTML file; return (status record, log message)."""
+    fname = os.path.basename(path)
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            html = f.read()
+        text, links, images, pc = parse_html(html)
+        wc, avg_wlen = word_stats(text)
+        sc = sentence_count(text)
+        out_obj = {
+            "source_file": fname,
+            "text": text,
+            "statistics": {
+                "word_count": wc,
+                "sentence_count": sc,
+                "paragraph_count": pc,
+                "avg_word_length": avg_wlen
+            },
+            "links": links,
+            "images": images,
+            "processed_at": iso_utc()
+        }
+        base = os.path.splitext(fname)[0] + ".json"
+        out_path = os.path.join(out_dir, base)
+        write_json(out_path, out_obj)
+        return {"input": fname, "output": base, "status": "success"}, f"Processed {fname} -> {base}"
+    except Exception as e:
+        return {"input": fname, "output": None, "status": "failed", "error": str(e)}, f"ERROR processing {fname}: {e}"
 
 def main():
     print(f"[{iso_utc()}] Processor starting", flush=True)
@@ -43,44 +97,17 @@ def main():
     os.makedirs(out_dir, exist_ok=True)
     os.makedirs(status_dir, exist_ok=True)
     fetch_done = os.path.join(status_dir, "fetch_complete.json")
-    while not os.path.exists(fetch_done):
-        print(f"[{iso_utc()}] Waiting for {fetch_done} ...", flush=True)
-        time.sleep(2)
+    wait_for(fetch_done)
     html_files = sorted(glob.glob(os.path.join(raw_dir, "page_*.html")))
     print(f"[{iso_utc()}] Found {len(html_files)} HTML files", flush=True)
     processed = []
-    for path in html_files:
-        fname = os.path.basename(path)
-        try:
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                html = f.read()
-            text, links, images = strip_html(html)
-            wc, avg_wlen = word_stats(text)
-            sc = sentence_count(text)
-            pc = paragraph_count_from_html(html)
-            out_obj = {
-                "source_file": fname,
-                "text": text,
-                "statistics": {
-                    "word_count": wc,
-                    "sentence_count": sc,
-                    "paragraph_count": pc,
-                    "avg_word_length": avg_wlen
-                },
-                "links": links,
-                "images": images,
-                "processed_at": iso_utc()
-            }
-            base = os.path.splitext(fname)[0] + ".json"
-            out_path = os.path.join(out_dir, base)
-            with open(out_path, "w", encoding="utf-8") as f:
-                json.dump(out_obj, f, ensure_ascii=False, indent=2)
-            processed.append({"input": fname, "output": base, "status": "success"})
-            print(f"[{iso_utc()}] Processed {fname} -> {base}", flush=True)
-        except Exception as e:
-            processed.append({"input": fname, "output": None, "status": "failed", "error": str(e)})
-            print(f"[{iso_utc()}] ERROR processing {fname}: {e}", flush=True)
-        time.sleep(0.2)
+    workers = os.cpu_count() or 1
+    chunksize = max(1, min(8, len(html_files) // (workers * 4)))
+    # files are independent; results come back in input order
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        for rec, msg in ex.map(process_one, html_files, itertools.repeat(out_dir), chunksize=chunksize):
+            processed.append(rec)
+            print(f"[{iso_utc()}] {msg}", flush=True)
     summary = {
         "timestamp": iso_utc(),
         "files_seen": len(html_files),
@@ -88,8 +115,7 @@ def main():
         "processed_failed": sum(1 for x in processed if x["status"] == "failed"),
         "results": processed
     }
-    with open(os.path.join(status_dir, "process_complete.json"), "w", encoding="utf-8") as f:
-        json.dump(summary, f, ensure_ascii=False, indent=2)
+    write_json(os.path.join(status_dir, "process_complete.json"), summary)
     print(f"[{iso_utc()}] Processor complete", flush=True)
 
 if __name__ == "__main__":